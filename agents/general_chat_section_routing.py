@@ -10,17 +10,24 @@ All section-to-section routing, exit detection, and internal section logic
 is now handled by the section nodes themselves.
 """
 
+import asyncio
 import os
-import json
+import random
 import re
-from typing import Any, Dict, Optional, List, Tuple
-from difflib import SequenceMatcher
+import time
+import logging
+import orjson
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, List, Sequence, Tuple
+from rapidfuzz import process, fuzz
 
 # litellm (sync/async wrappers) - use completion or acompletion based on your runtime preference
-from litellm import completion, acompletion
+import litellm
+from litellm import completion, acompletion, supports_response_schema
 
 #local file imports
-from agents.resume_builder_state import ResumeBuilderState
+from agents.resume_builder_state import ResumeBuilderState, SECTION_NAMES
 
 # -----------------------
 # Constants
@@ -29,46 +36,107 @@ LLM_MODEL = os.environ.get("LLM_MODEL", "gemini/gemini-2.5-flash-lite")
 GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY")
 OFFLINE_MODE = GOOGLE_API_KEY is None
 MAX_ROUTING_ATTEMPTS = 3  # Prevent infinite loops
+_DEBUG = bool(os.environ.get("LLM_DEBUG"))  # Enables per-call token usage printing
+
+logger = logging.getLogger(__name__)
+
+# Client-side throttling for every LLM request: token bucket (requests per minute) plus
+# exponential backoff with jitter on rate-limit/transient errors. Set by configure_llm_rate_limit().
+LLM_RATE_LIMIT_RPM = 500
+LLM_MAX_RETRIES = 3
+LLM_BACKOFF_BASE = 1.0  # seconds
+LLM_BACKOFF_MAX = 10.0  # seconds
+_RETRYABLE_LLM_ERRORS = (
+    litellm.RateLimitError, litellm.ServiceUnavailableError,
+    litellm.APIConnectionError, litellm.Timeout,
+)
+
+# Common variations and aliases for section names
+_SECTION_ALIASES = {
+    'skill': 'skills',
+    'experience': 'experiences', 
+    'exp': 'experiences',
+    'work': 'experiences',
+    'edu': 'education',
+    'school': 'education',
+    'project': 'projects',
+    'cert': 'certificates',
+    'certification': 'certificates',
+    'certs': 'certificates',
+    'pub': 'publications',
+    'publication': 'publications',
+    'papers': 'publications',
+    'lang': 'languages',
+    'language': 'languages',
+    'rec': 'recommendations',
+    'recommendation': 'recommendations',
+    'refs': 'recommendations',
+    'references': 'recommendations',
+    'contact': 'contact',
+    'contacts': 'contact',
+    'summary': 'summary',
+    'about': 'summary',
+    'custom': 'custom',
+    'other': 'custom',
+    'additional': 'custom'
+}
+
+# JSON schema of the general chat decision; the action enum doubles as the list of valid actions
+ROUTER_DECISION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "action": {"type": "string", "enum": ["answer", "route"]},
+        "route": {"type": "string"},
+        "answer": {"type": "string"}
+    },
+    "required": ["action", "answer"]
+}
+_VALID_ACTIONS = tuple(ROUTER_DECISION_SCHEMA["properties"]["action"]["enum"])
+
+# Rolling context window: once context exceeds the max, the oldest batch is folded into context_summary
+MAX_CONTEXT_MESSAGES = 40
+CONTEXT_COMPACT_BATCH = 20
+MAX_CONTEXT_SUMMARY_CHARS = 2000
+
+# Recent general chat decisions keyed by (normalized user text, section/JD fingerprint)
+DECISION_CACHE_SIZE = 128
+DECISION_CACHE_TTL = 300  # seconds
+_DECISION_CACHE: "OrderedDict[Tuple[str, tuple], Tuple[float, Dict[str, Any]]]" = OrderedDict()
 
 def safe_extract_text(resp: Any) -> Optional[str]:
     """Extract the assistant text from common litellm ModelResponse shapes."""
     try:
-        # Handle ModelResponse objects directly
-        if hasattr(resp, "choices") and resp.choices:
-            c0 = resp.choices[0]
-            if hasattr(c0, "message") and c0.message:
-                return getattr(c0.message, "content", None)
-        # Handle streaming chunk-like objects or other common structures
-        if hasattr(resp, "choices") and resp.choices:
-            c0 = resp.choices[0]
-            # Check for delta content first (common in streaming)
-            if hasattr(c0, "delta") and c0.delta:
-                return getattr(c0.delta, "content", None)
-            # Fallback to message content if delta is not present
-            if hasattr(c0, "message") and c0.message:
-                return getattr(c0.message, "content", None)
-        if hasattr(resp, "text") and resp.text:
-            return resp.text
         # Handle dictionary responses
         if isinstance(resp, dict):
-            if "choices" in resp and resp["choices"]:
-                ch = resp["choices"][0]
-                if isinstance(ch, dict):
-                    if "message" in ch and isinstance(ch["message"], dict):
-                        return ch["message"].get("content")
-            if "candidates" in resp and resp["candidates"]:
+            choices = resp.get("choices")
+            if choices:
+                ch = choices[0]
+                if isinstance(ch, dict) and isinstance(ch.get("message"), dict):
+                    return ch["message"].get("content")
+            if resp.get("candidates"):
                 return resp["candidates"][0].get("content")
-            if "content" in resp: # Direct content in dict
-                return resp.get("content")
+            return resp.get("content")  # Direct content in dict
+        # ModelResponse objects (common path) - resolve the attribute chain directly
+        try:
+            return resp.choices[0].message.content
+        except (AttributeError, IndexError, TypeError):
+            pass
+        # Streaming chunk-like objects carry a delta instead of a message
+        try:
+            return resp.choices[0].delta.content
+        except (AttributeError, IndexError, TypeError):
+            pass
+        return getattr(resp, "text", None) or None
     except Exception as e:
         # Log the exception if any error occurs during extraction
-        print(f"Warning: Error extracting text from response: {e}")
-        pass
+        logger.warning("Error extracting text from response: %s", e)
     # Return None if content cannot be extracted
     return None
 
 def maybe_print_usage(resp: Any, label: str = ""):
-    """Best-effort token usage printer for common shapes returned by litellm."""
+    """Best-effort token usage printer for common shapes returned by litellm (only when LLM_DEBUG is set)."""
+    if not _DEBUG:
+        return
     try:
         # 1) ModelResponse.usage
         if hasattr(resp, "usage") and resp.usage:
@@ -76,97 +144,172 @@ def maybe_print_usage(resp: Any, label: str = ""):
             prompt = getattr(u, "prompt_tokens", getattr(u, "prompt_token_count", None))
             completion_t = getattr(u, "completion_tokens", getattr(u, "candidates_token_count", None))
             total = getattr(u, "total_tokens", getattr(u, "total_token_count", None))
-            print(f"[Token Usage {label}] prompt={prompt} completion={completion_t} total={total}")
+            logger.info("[Token Usage %s] prompt=%s completion=%s total=%s", label, prompt, completion_t, total)
             return
         # 2) dict usage
         if isinstance(resp, dict) and "usage" in resp:
             u = resp["usage"]
-            print(f"[Token Usage {label}] prompt={u.get('prompt_tokens')} completion={u.get('completion_tokens')} total={u.get('total_tokens')}")
+            logger.info("[Token Usage %s] prompt=%s completion=%s total=%s", label, u.get("prompt_tokens"), u.get("completion_tokens"), u.get("total_tokens"))
     except Exception as e:
         # Log any errors during usage printing
-        print(f"Warning: Error printing token usage: {e}")
+        logger.warning("Error reporting token usage: %s", e)
         pass
 
-def normalize_section_name(section_name: str, available_sections: List[str]) -> Optional[str]:
+def normalize_section_name(section_name: str, available_sections: Sequence[str] = SECTION_NAMES, fuzzy: bool = True) -> Optional[str]:
     """
     Normalize and match section names with fuzzy matching for typos.
+    With fuzzy=False only exact names and aliases match.
     Returns the correct section name or None if no good match found.
     """
     if not section_name or not available_sections:
         return None
-    
-    # Clean the input
-    clean_input = section_name.lower().strip()
-    
+    # Section lists are stable within a session - pass them as tuples to hit the cache
+    if not isinstance(available_sections, tuple):
+        available_sections = tuple(available_sections)
+    return _match_section_name(section_name.lower().strip(), available_sections, fuzzy)
+
+@lru_cache(maxsize=256)
+def _match_section_name(clean_input: str, available_sections: Tuple[str, ...], fuzzy: bool) -> Optional[str]:
     # Exact match first
     if clean_input in available_sections:
         return clean_input
     
-    # Common variations and aliases
-    section_aliases = {
-        'skill': 'skills',
-        'experience': 'experiences', 
-        'exp': 'experiences',
-        'work': 'experiences',
-        'edu': 'education',
-        'school': 'education',
-        'project': 'projects',
-        'cert': 'certificates',
-        'certification': 'certificates',
-        'certs': 'certificates',
-        'pub': 'publications',
-        'publication': 'publications',
-        'papers': 'publications',
-        'lang': 'languages',
-        'language': 'languages',
-        'rec': 'recommendations',
-        'recommendation': 'recommendations',
-        'refs': 'recommendations',
-        'references': 'recommendations',
-        'contact': 'contact',
-        'contacts': 'contact',
-        'summary': 'summary',
-        'about': 'summary',
-        'custom': 'custom',
-        'other': 'custom',
-        'additional': 'custom'
-    }
-    
     # Check aliases
-    if clean_input in section_aliases:
-        canonical = section_aliases[clean_input]
-        if canonical in available_sections:
-            return canonical
-    
-    # Fuzzy matching for typos (similarity > 0.6)
-    best_match = None
-    best_similarity = 0.0
-    
-    for section in available_sections:
-        similarity = SequenceMatcher(None, clean_input, section).ratio()
-        if similarity > best_similarity and similarity > 0.6:  # 60% similarity threshold
-            best_similarity = similarity
-            best_match = section
+    canonical = _SECTION_ALIASES.get(clean_input)
+    if canonical is not None and canonical in available_sections:
+        return canonical
+    if not fuzzy:
+        return None
     
-    return best_match
+    # Fuzzy matching for typos (60% similarity threshold) - rapidfuzz C++ scorer
+    match = process.extractOne(clean_input, available_sections, scorer=fuzz.ratio, score_cutoff=60)
+    return match[0] if match else None
+
+def find_json_span(text: str) -> Optional[str]:
+    """
+    Return the first balanced {...} block in text using a single linear scan.
+    Tracks string/escape state so braces inside JSON strings are ignored.
+    """
+    depth = 0
+    start = -1
+    in_str = False
+    esc = False
+    for i, ch in enumerate(text):
+        if in_str:
+            if esc:
+                esc = False
+            elif ch == "\\":
+                esc = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            if depth > 0:
+                in_str = True
+        elif ch == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == "}" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+_JSON_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+_JSON_STRING_VALUE_RE = re.compile(r'\s*:\s*"')
+
+class JsonStringFieldStream:
+    """
+    Incrementally decode one string field of a streamed JSON object, so its text can be
+    shown while the rest of the object is still being generated.
+    """
+
+    def __init__(self, field: str):
+        self._key = f'"{field}"'
+        self._buf = ""
+        self._pos: Optional[int] = None  # index of the next undecoded character of the value
+        self.done = False
+
+    def feed(self, piece: str) -> str:
+        """Add a streamed piece and return the newly decoded part of the field value."""
+        self._buf += piece
+        if self.done:
+            return ""
+        buf = self._buf
+        if self._pos is None:
+            key_at = buf.find(self._key)
+            if key_at < 0:
+                return ""
+            value = _JSON_STRING_VALUE_RE.match(buf, key_at + len(self._key))
+            if value is None:
+                return ""  # colon/quote not streamed yet (or not a string value)
+            self._pos = value.end()
+        out: List[str] = []
+        i, n = self._pos, len(buf)
+        while i < n:
+            ch = buf[i]
+            if ch == '"':
+                self.done = True
+                break
+            if ch != "\\":
+                out.append(ch)
+                i += 1
+                continue
+            if i + 1 >= n:
+                break  # escape split across pieces - wait for the rest
+            esc = buf[i + 1]
+            if esc != "u":
+                out.append(_JSON_ESCAPES.get(esc, esc))
+                i += 2
+                continue
+            if i + 6 > n:
+                break
+            code = int(buf[i + 2:i + 6], 16)
+            if 0xD800 <= code < 0xDC00:
+                # Surrogate pair: wait for the low half, then combine
+                if i + 12 > n:
+                    break
+                low = int(buf[i + 8:i + 12], 16)
+                code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                i += 6
+            out.append(chr(code))
+            i += 6
+        self._pos = i
+        return "".join(out)
+
+def parse_json_object(raw_text: str) -> Optional[Any]:
+    """
+    Parse the JSON object out of an LLM reply: directly when the reply is pure JSON,
+    otherwise the first balanced {...} block. Returns None if the reply has no object.
+    Raises orjson.JSONDecodeError if the embedded block is not valid JSON.
+    """
+    stripped = raw_text.strip()
+    # Fast path: model returned pure JSON, parse it directly without scanning
+    if stripped.startswith("{") and stripped.endswith("}"):
+        try:
+            return orjson.loads(stripped)
+        except orjson.JSONDecodeError:
+            pass
+    json_text = find_json_span(stripped)
+    if json_text is None:
+        return None
+    return orjson.loads(json_text)
 
-def extract_and_validate_json(raw_text: str) -> Dict[str, Any]:
+def extract_and_validate_json(raw_text: str, valid_actions: Sequence[str] = _VALID_ACTIONS) -> Dict[str, Any]:
     """
     Extract JSON from raw text and validate basic structure.
+    Unknown actions fall back to the first entry of valid_actions.
     Raises ValueError if no valid JSON found or required keys missing.
     """
-    if not raw_text or not raw_text.strip():
+    stripped = raw_text.strip() if raw_text else ""
+    if not stripped:
         raise ValueError("Empty response from LLM")
     
-    # Try to find JSON block in response
-    json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', raw_text, re.DOTALL)
-    if not json_match:
-        # If no JSON found, treat entire text as answer
-        return {"action": "answer", "route": None, "answer": raw_text.strip()}
-    
-    json_text = json_match.group(0)
     try:
-        parsed = json.loads(json_text)
+        parsed = parse_json_object(stripped)
+        if parsed is None:
+            # If no JSON found, treat entire text as answer
+            return {"action": valid_actions[0], "route": None, "answer": stripped}
         
         # Validate required keys
         if not isinstance(parsed, dict):
@@ -175,30 +318,24 @@ def extract_and_validate_json(raw_text: str) -> Dict[str, Any]:
         if "action" not in parsed:
             raise ValueError("Missing required 'action' key in JSON response")
         
-        # Valid actions for general chat only
-        valid_actions = {"answer", "route"}
         if parsed["action"] not in valid_actions:
-            print(f"Warning: Unexpected action '{parsed['action']}', treating as 'answer'")
-            parsed["action"] = "answer"
+            logger.warning("Unexpected action %r, treating as %r", parsed["action"], valid_actions[0])
+            parsed["action"] = valid_actions[0]
         
         return parsed
         
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON format: {e}")
 
 def safe_initialize_answers(state: ResumeBuilderState, section_name: str, questions: List[str]) -> None:
     """Safely initialize answers array for a section with proper synchronization."""
-    if section_name not in state.recommended_answers:
-        state.recommended_answers[section_name] = [""] * len(questions)
-    else:
-        # Ensure array length matches questions count
-        current_answers = state.recommended_answers[section_name]
-        if len(current_answers) != len(questions):
-            # Resize array, preserving existing answers
-            new_answers = [""] * len(questions)
-            for i in range(min(len(current_answers), len(questions))):
-                new_answers[i] = current_answers[i]
-            state.recommended_answers[section_name] = new_answers
+    # Resize in place, preserving existing answers - no copy when lengths already match
+    answers = state.recommended_answers.setdefault(section_name, [])
+    n = len(questions)
+    if len(answers) < n:
+        answers.extend([""] * (n - len(answers)))
+    elif len(answers) > n:
+        del answers[n:]
 
 def detect_question_matches(user_answer: str, questions: List[str]) -> List[Tuple[int, str, float]]:
     """
@@ -221,12 +358,112 @@ def detect_question_matches(user_answer: str, questions: List[str]) -> List[Tupl
     # Sort by confidence (highest first)
     return sorted(matches, key=lambda x: x[2], reverse=True)
 
-async def call_llm_json_decision(system_prompt: str, user_payload: Dict[str, Any], max_tokens: int = 300) -> Dict[str, Any]:
+@lru_cache(maxsize=None)
+def _model_supports_schema(model: str) -> bool:
+    try:
+        return bool(supports_response_schema(model=model))
+    except Exception:
+        return False
+
+def json_response_format(name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """response_format for a JSON reply: schema-constrained where the model supports it, plain JSON mode otherwise."""
+    if _model_supports_schema(LLM_MODEL):
+        return {"type": "json_schema", "json_schema": {"name": name, "schema": schema}}
+    return {"type": "json_object"}
+
+async def collect_json_stream(resp: Any, usage_label: str, on_piece: Optional[Callable[[str], None]] = None) -> str:
+    """
+    Accumulate a streamed completion and stop as soon as the JSON object is closed.
+    on_piece, if given, is called with every text piece as it arrives.
+    """
+    parts: List[str] = []
+    try:
+        async for chunk in resp:
+            maybe_print_usage(chunk, usage_label)
+            piece = safe_extract_text(chunk)
+            if not piece:
+                continue
+            parts.append(piece)
+            if on_piece is not None:
+                on_piece(piece)
+            if "}" in piece and find_json_span("".join(parts)) is not None:
+                break
+    finally:
+        # Release the provider connection if we stopped early
+        aclose = getattr(resp, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    return "".join(parts)
+
+class AsyncTokenBucket:
+    """
+    Async token bucket: allows `rate` acquisitions per `period` seconds, with bursts up to `rate`.
+    Waiters sleep until their token is due instead of polling.
+    """
+
+    def __init__(self, rate: float, period: float = 60.0):
+        self.capacity = float(rate)
+        self.fill_rate = rate / period  # tokens per second
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.fill_rate if self._tokens < 0 else 0.0
+        # Token is reserved already, so sleep outside the lock and let later callers queue behind
+        if wait:
+            await asyncio.sleep(wait)
+
+    async def __aenter__(self) -> "AsyncTokenBucket":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+_LLM_LIMITER: Optional[AsyncTokenBucket] = AsyncTokenBucket(LLM_RATE_LIMIT_RPM)
+
+def configure_llm_rate_limit(rpm: Optional[float] = LLM_RATE_LIMIT_RPM, max_retries: int = LLM_MAX_RETRIES) -> None:
+    """Set the requests-per-minute budget (falsy disables throttling) and retry count for LLM calls."""
+    global _LLM_LIMITER, LLM_MAX_RETRIES
+    _LLM_LIMITER = AsyncTokenBucket(rpm) if rpm else None
+    LLM_MAX_RETRIES = max(0, int(max_retries))
+
+async def throttled_acompletion(**kwargs: Any) -> Any:
+    """
+    acompletion() behind the shared token bucket, retried with exponential backoff plus full
+    jitter on rate-limit and transient connection errors. For streamed calls only opening the
+    stream is retried.
+    """
+    attempt = 0
+    while True:
+        if _LLM_LIMITER is not None:
+            await _LLM_LIMITER.acquire()
+        try:
+            return await acompletion(**kwargs)
+        except _RETRYABLE_LLM_ERRORS as e:
+            if attempt >= LLM_MAX_RETRIES:
+                raise
+            delay = random.uniform(0, min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * 2 ** attempt))
+            attempt += 1
+            logger.warning("LLM call failed (%s), retry %d/%d in %.1fs", type(e).__name__, attempt, LLM_MAX_RETRIES, delay)
+            await asyncio.sleep(delay)
+
+async def call_llm_json_decision(system_prompt: str, user_payload: Dict[str, Any], max_tokens: int = 300,
+                                 schema: Dict[str, Any] = ROUTER_DECISION_SCHEMA,
+                                 schema_name: str = "router_decision") -> Dict[str, Any]:
     """
     Call the LLM (async) and expect JSON decision output with robust error handling.
+    The reply is constrained to `schema` (a decision object with an "action" enum) and
+    streamed; the stream is cut off once a complete JSON object arrives.
     """
     # Build message: use a compact JSON payload to keep tokens small
-    user_text = json.dumps(user_payload, separators=(",", ":"), ensure_ascii=False)
+    user_text = orjson.dumps(user_payload).decode()  # orjson output is already compact utf-8
     messages = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_text}
@@ -241,17 +478,73 @@ async def call_llm_json_decision(system_prompt: str, user_payload: Dict[str, Any
         return {"action": "answer", "route": None, "answer": "(Offline) I received your query and will help once an API key is configured."}
     
     try:
-        resp = await acompletion(model=LLM_MODEL, messages=messages, max_completion_tokens=max_tokens, **extra)
-        maybe_print_usage(resp, "router")
-        raw = safe_extract_text(resp) or ""
+        resp = await throttled_acompletion(
+            model=LLM_MODEL, messages=messages, max_completion_tokens=max_tokens, stream=True,
+            response_format=json_response_format(schema_name, schema), **extra
+        )
+        
+        # Stream the reply and stop as soon as the JSON decision object is closed
+        raw = await collect_json_stream(resp, "router")
         
         # Use robust JSON extraction and validation
-        return extract_and_validate_json(raw)
+        return extract_and_validate_json(raw, schema["properties"]["action"]["enum"])
         
     except Exception as e:
         # Connectivity or auth issue -> degrade gracefully
-        print(f"LLM call error: {e}")
-        return {"action": "answer", "route": None, "answer": f"I encountered an error processing your request. Please try again."}
+        logger.debug("LLM call error: %s", e)
+        return {"action": "answer", "route": None, "answer": f"I encountered an error processing your request. Please try again.", "error": True}
+
+def trim_context(state: ResumeBuilderState) -> None:
+    """Keep state.context bounded by folding the oldest messages into state.context_summary."""
+    context = state.context
+    if len(context) <= MAX_CONTEXT_MESSAGES:
+        return
+    folded = "\n".join(f"{m.role}: {m.content}" for m in context[:CONTEXT_COMPACT_BATCH] if m.content)
+    summary = f"{state.context_summary}\n{folded}" if state.context_summary else folded
+    state.context_summary = summary[-MAX_CONTEXT_SUMMARY_CHARS:]
+    del context[:CONTEXT_COMPACT_BATCH]
+
+def append_bounded(state: ResumeBuilderState, message: Any) -> None:
+    """Append a message to state.context, folding the oldest entries away once it is over the cap."""
+    state.context.append(message)
+    trim_context(state)
+
+def get_cached_decision(key: Tuple[str, tuple]) -> Optional[Dict[str, Any]]:
+    """Return a recent decision for this query/fingerprint, or None if missing or expired."""
+    entry = _DECISION_CACHE.get(key)
+    if entry is None:
+        return None
+    stored_at, decision = entry
+    if time.monotonic() - stored_at > DECISION_CACHE_TTL:
+        del _DECISION_CACHE[key]
+        return None
+    _DECISION_CACHE.move_to_end(key)
+    return decision
+
+def store_cached_decision(key: Tuple[str, tuple], decision: Dict[str, Any]) -> None:
+    """Remember a decision, evicting the least recently used entry when full."""
+    _DECISION_CACHE[key] = (time.monotonic(), decision)
+    _DECISION_CACHE.move_to_end(key)
+    if len(_DECISION_CACHE) > DECISION_CACHE_SIZE:
+        _DECISION_CACHE.popitem(last=False)
+
+def render_initial_greeting(state: ResumeBuilderState) -> str:
+    """Render the session welcome (JD summary + section alignment overview) without an LLM call."""
+    jd_text = " ".join((state.jd_summary or "").split())
+    if len(jd_text) > 300:
+        jd_text = jd_text[:300].rsplit(" ", 1)[0] + "..."
+    lines = ["Hi! I'm your resume assistant."]
+    if jd_text:
+        lines.append(f"Here's a quick summary of the JD: {jd_text}")
+    if state.section_objects:
+        lines.append("")
+        lines.append("Section alignment:")
+        for s, data in state.section_objects.items():
+            score = data.get("alignment_score")
+            lines.append(f"- {s}: {score}%" if score is not None else f"- {s}: not scored")
+    lines.append("")
+    lines.append("Which section would you like to work on?")
+    return "\n".join(lines)
 
 # -----------------------
 # Node: general_chat_and_section_routing
@@ -266,81 +559,116 @@ async def general_chat_and_section_routing(state: ResumeBuilderState, config: Di
     
     All section-to-section routing is handled by section_chat_node internally.
     """
-    # Initialize routing attempt counter if not exists
-    if not hasattr(state, 'routing_attempts'):
-        state.routing_attempts = 0
+    # Hot fields are bound to locals once (pydantic models can't use __slots__);
+    # the routing attempt counter is written back once on exit
+    context = state.context
+    section_objects = state.section_objects
+    attempts = state.routing_attempts
     
     # Prevent infinite loops
-    if state.routing_attempts >= MAX_ROUTING_ATTEMPTS:
-        print(f"Maximum routing attempts ({MAX_ROUTING_ATTEMPTS}) reached, ending conversation")
+    if attempts >= MAX_ROUTING_ATTEMPTS:
+        logger.info("Maximum routing attempts (%d) reached, ending conversation", MAX_ROUTING_ATTEMPTS)
         state.current_section = None
         state.routing_attempts = 0
         state.next_action = None
-        state.context.append(state.make_message(
+        context.append(state.make_message(
             "assistant",
             "Let's start fresh - how can I help you with your resume?"
         ))
+        trim_context(state)
         return state
     
-    state.routing_attempts += 1
+    attempts += 1
     
     # This should ONLY be called for general chat scenarios
     if state.current_section is not None:
-        print(f"Warning: GeneralChat called while in section '{state.current_section}' - this shouldn't happen")
+        logger.warning("GeneralChat called while in section %r - this shouldn't happen", state.current_section)
         # Reset to general chat state
         state.current_section = None
         state.next_action = None
     
     # Detect if this is the first turn (no user message yet)
-    last_msg = state.context[-1] if state.context else None
-    first_turn = not state.context or (last_msg and getattr(last_msg, "role", "") != "user")
-    user_text = ""
+    last_msg = context[-1] if context else None
+    first_turn = last_msg is None or last_msg.role != "user"
     
-    if not first_turn:
-        user_text = getattr(last_msg, "content", "") or ""
-    else:
-        # Seed a synthetic user query to drive initial LLM greeting
-        user_text = "INITIAL_GREETING: Greet user, summarize JD, show sections with alignment scores."
+    if first_turn:
+        # The greeting is fully determined by the JD and section scores - render it locally
+        context.append(state.make_message("assistant", render_initial_greeting(state)))
+        state.routing_attempts = 0
+        state.next_action = None
+        trim_context(state)
+        return state
+    
+    user_text = last_msg.content or ""
 
-    # Build compact payload for LLM - section summaries for general chat overview
-    compact_sections = {}
-    for s, data in state.section_objects.items():
-        compact_sections[s] = {
-            "alignment_score": data.get("alignment_score"),
-            "missing_requirements": data.get("missing_requirements", [])[:2]  # Only first 2 for overview
-        }
+    # Section/JD fingerprint - the prompt only changes when these do
+    jd_text = (state.jd_summary or "No JD provided")[:300]
+    prompt_key = (
+        tuple(
+            (s, data.get("alignment_score"), tuple(data.get("missing_requirements", [])[:2]))
+            for s, data in section_objects.items()
+        ),
+        jd_text,
+    )
+
+    if prompt_key == state._cached_prompt_key:
+        # Reuse previously rendered prompt and section summaries
+        system_prompt = state._cached_prompt
+        compact_sections = state._cached_compact_sections
+    else:
+        # Build compact payload for LLM - section summaries for general chat overview
+        compact_sections = {}
+        for s, data in section_objects.items():
+            compact_sections[s] = {
+                "alignment_score": data.get("alignment_score"),
+                "missing_requirements": data.get("missing_requirements", [])[:2]  # Only first 2 for overview
+            }
 
-    # General chat system prompt - simplified since we only handle initial routing
-    system_prompt = f"""You are a resume assistant in GENERAL CHAT mode.
+        # General chat system prompt - simplified since we only handle initial routing
+        system_prompt = f"""You are a resume assistant in GENERAL CHAT mode.
 
-AVAILABLE SECTIONS: {json.dumps(compact_sections, separators=(",", ":"))}
-JD SUMMARY: {(state.jd_summary or "No JD provided")[:300]}
+AVAILABLE SECTIONS: {orjson.dumps(compact_sections).decode()}
+JD SUMMARY: {jd_text}
 
 RESPONSE FORMAT: {{"action": "answer|route", "route": "section_name_or_null", "answer": "response_text"}}
 
 RULES:
-1. If user_text starts with 'INITIAL_GREETING': Provide friendly welcome, JD summary, section alignment overview
-2. action='route' ONLY when user explicitly wants to work on/edit a specific section
-3. action='answer' for questions, general chat, or unclear intent  
-4. When routing, use exact section name from available sections
-5. Keep responses helpful, under 150 words
-6. Show section alignment scores when relevant
-7. This is ONLY for general chat - section work happens elsewhere
+1. action='route' ONLY when user explicitly wants to work on/edit a specific section
+2. action='answer' for questions, general chat, or unclear intent  
+3. When routing, use exact section name from available sections
+4. Keep responses helpful, under 150 words
+5. Show section alignment scores when relevant
+6. This is ONLY for general chat - section work happens elsewhere
 
 Available sections: {list(compact_sections.keys())}"""
+
+        state._cached_prompt_key = prompt_key
+        state._cached_prompt = system_prompt
+        state._cached_compact_sections = compact_sections
+        state._cached_sections = tuple(compact_sections.keys())
+        state._cached_sorted_sections = tuple(sorted(state._cached_sections))
     
     payload = {
         "user_query": user_text,
-        "sections_summary": compact_sections,
-        "is_initial_greeting": first_turn
+        "sections_summary": compact_sections
     }
 
     # Call LLM for general chat / initial routing decision
     try:
-        parsed = await call_llm_json_decision(system_prompt, payload, max_tokens=400)
+        query_norm = user_text.lower().strip()
+        if query_norm in state._cached_sections or query_norm in _SECTION_ALIASES:
+            # User just typed a section name - route deterministically
+            parsed = {"action": "route", "route": query_norm, "answer": ""}
+        else:
+            cache_key = (query_norm, prompt_key)
+            parsed = get_cached_decision(cache_key)
+            if parsed is None:
+                parsed = await call_llm_json_decision(system_prompt, payload, max_tokens=400)
+                if not OFFLINE_MODE and not parsed.get("error"):
+                    store_cached_decision(cache_key, parsed)
         
         # Reset routing attempts on successful processing
-        state.routing_attempts = 0
+        attempts = 0
         
         # Process LLM decision
         action = parsed.get("action")
@@ -349,21 +677,21 @@ Available sections: {list(compact_sections.keys())}"""
         
         if action == "route" and route_to:
             # Route to a section - this is the ONLY routing this node does
-            available_sections = list(compact_sections.keys())
+            available_sections = state._cached_sections
             normalized_section = normalize_section_name(route_to, available_sections)
             
             if normalized_section:
                 state.current_section = normalized_section
                 state.next_action = "section_chat"  # Start with section chat
-                print(f"Routing from general chat to section: {normalized_section}")
+                logger.debug("Routing from general chat to section: %s", normalized_section)
                 if normalized_section != route_to:
-                    print(f"Note: Corrected '{route_to}' to '{normalized_section}'")
+                    logger.debug("Corrected %r to %r", route_to, normalized_section)
                 return state
             else:
                 # No good match found - stay in general chat
-                state.context.append(state.make_message(
+                context.append(state.make_message(
                     "assistant",
-                    f"I couldn't find section '{route_to}'. Available: {', '.join(sorted(available_sections))}. Which would you like to work on?"
+                    f"I couldn't find section '{route_to}'. Available: {', '.join(state._cached_sorted_sections)}. Which would you like to work on?"
                 ))
                 state.next_action = None
                 return state
@@ -372,18 +700,21 @@ Available sections: {list(compact_sections.keys())}"""
             # action == "answer" or fallback - general chat response
             state.next_action = None
             if answer_text:
-                state.context.append(state.make_message("assistant", answer_text))
+                context.append(state.make_message("assistant", answer_text))
             else:
-                state.context.append(state.make_message("assistant", "How can I help you with your resume today?"))
+                context.append(state.make_message("assistant", "How can I help you with your resume today?"))
             return state
             
     except ValueError as e:
-        print(f"JSON parsing error in general chat: {e}")
-        state.context.append(state.make_message("assistant", "Could you please rephrase your request?"))
+        logger.warning("JSON parsing error in general chat: %s", e)
+        context.append(state.make_message("assistant", "Could you please rephrase your request?"))
         state.next_action = None
         return state
     except Exception as e:
-        print(f"Unexpected error in general chat: {e}")
-        state.context.append(state.make_message("assistant", "How can I help you with your resume?"))
+        logger.warning("Unexpected error in general chat: %s", e)
+        context.append(state.make_message("assistant", "How can I help you with your resume?"))
         state.next_action = None
-        return state
\ No newline at end of file
+        return state
+    finally:
+        state.routing_attempts = attempts
+        trim_context(state)
\ No newline at end of file
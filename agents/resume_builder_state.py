@@ -1,20 +1,77 @@
 # agents/resume_builder_state.py
-from typing import Any, Dict, List, Optional
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 from datetime import datetime, timezone
-from pydantic import Field
+from pydantic import ConfigDict, Field, PrivateAttr
 from pyagenity.state import AgentState
 from pyagenity.utils import Message
 from pyagenity.utils.constants import START
 from pyagenity.state.execution_state import ExecutionState as ExecMeta
 
+# Fixed set of resume sections the assistant knows how to work on
+SECTION_NAMES = ("skills", "experiences", "education", "projects", "summary", "contact", "certificates", "publications", "languages", "recommendations", "custom")
+
+# Section object fields that are only ever replaced as a whole, never mutated in place
+FROZEN_SECTION_FIELDS = ("missing_requirements", "recommended_questions")
+
+def freeze_section_object(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Store a section object's list fields as tuples of interned strings (in place) and return it.
+
+    The tuples are used directly as cache keys and are shared, not copied, by state snapshots;
+    interning lets requirements repeated across sections share one string object.
+    """
+    for field in FROZEN_SECTION_FIELDS:
+        value = data.get(field)
+        if isinstance(value, (list, tuple)):
+            data[field] = tuple(sys.intern(item) if type(item) is str else item for item in value)
+    return data
+
+@dataclass(frozen=True, slots=True)
+class Language:
+    """One entry of the `languages` resume section."""
+    name: str
+    proficiency: str
+
+@dataclass(frozen=True, slots=True)
+class Recommendation:
+    """One entry of the `recommendations` resume section."""
+    name: str
+    position: str
+    text: str
+    date: str
+
+# Resume sections stored as a tuple of records instead of a list of same-shaped dicts
+SECTION_RECORD_TYPES = {"languages": Language, "recommendations": Recommendation}
+
+def freeze_resume_sections(sections: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert loaded resume sections (in place) to compact immutable values and return them.
+
+    List-of-dict sections become tuples of records and the lists under `custom` become tuples.
+    Records are slotted dataclasses, which orjson serializes exactly like the original dicts.
+    """
+    for name, record_type in SECTION_RECORD_TYPES.items():
+        value = sections.get(name)
+        if isinstance(value, list):
+            sections[name] = tuple(record_type(**item) if isinstance(item, dict) else item for item in value)
+    custom = sections.get("custom")
+    if isinstance(custom, dict):
+        for key, value in custom.items():
+            if isinstance(value, list):
+                custom[key] = tuple(value)
+    return sections
+
 class ResumeBuilderState(AgentState):
     """Custom state container for the resume builder."""
+    # Nodes mutate the state in place every turn - skip per-assignment validation
+    model_config = ConfigDict(validate_assignment=False, arbitrary_types_allowed=True)
+
     jd_summary: Optional[str] = None
     resume_sections: Dict[str, Any] = None
     section_objects: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
     current_section: Optional[str] = None
-    section_done: Dict[str, bool] = Field(default_factory=lambda: {s: False for s in ["skills", "experiences", "education", "projects", "summary", "contact", "certificates", "publications", "languages", "recommendations", "custom"]})
+    section_done: Dict[str, bool] = Field(default_factory=lambda: {s: False for s in SECTION_NAMES})
     context: List[Message] = Field(default_factory=list)
     context_summary: Optional[str] = None
     execution_meta: ExecMeta = Field(default_factory=lambda: ExecMeta(current_node=START))
@@ -24,23 +81,50 @@ class ResumeBuilderState(AgentState):
     routing_attempts: int = Field(default=0)
     
     # NEW: Add next_action field for routing between specialized nodes
-    next_action: Optional[str] = Field(default=None)  # Can be: "section_chat", "section_updater", "section_applier"
+    next_action: Optional[str] = Field(default=None)  # Can be: "section_chat", "exit_to_general"
     
     # NEW: Add temporary storage for proposed section content (before applying)
     proposed_section_content: Optional[str] = Field(default=None)
 
+    # Rendered general chat prompt, reused while the section/JD fingerprint is unchanged
+    _cached_prompt_key: Optional[tuple] = PrivateAttr(default=None)
+    _cached_prompt: Optional[str] = PrivateAttr(default=None)
+    _cached_compact_sections: Dict[str, Dict[str, Any]] = PrivateAttr(default_factory=dict)
+    # Section names in insertion and sorted order - cleared whenever a section is added
+    _cached_sections: tuple = PrivateAttr(default=())
+    _cached_sorted_sections: tuple = PrivateAttr(default=())
+
+    # Rendered Q&A block per section for the updater: section -> (hash of questions/answers, text)
+    _qa_block_cache: Dict[str, Tuple[int, str]] = PrivateAttr(default_factory=dict)
+
+    # Analysis returned with the proposed section content: (section, content, analysis dict)
+    _pending_analysis: Optional[tuple] = PrivateAttr(default=None)
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> "ResumeBuilderState":
+        """Snapshot copy, taken by the checkpointer at the end of every invocation.
+
+        Context messages are never modified after they are appended, and the private
+        attributes are caches, so the snapshot shares them instead of deep-copying them.
+        """
+        memo = {} if memo is None else memo
+        for message in self.context:
+            memo[id(message)] = message
+        for value in (self.__pydantic_private__ or {}).values():
+            memo[id(value)] = value
+        return super().__deepcopy__(memo)
+
+    def get_section_names(self) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """Return (section names, sorted section names), rebuilt only after the cache is cleared."""
+        if not self._cached_sections and self.section_objects:
+            self._cached_sections = tuple(self.section_objects)
+            self._cached_sorted_sections = tuple(sorted(self._cached_sections))
+        return self._cached_sections, self._cached_sorted_sections
+
     def make_message(self, role: str, content: str) -> Message:
-        msg_dict = {
-            "message_id": str(uuid4()),
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        }
-        try:
-            return Message(**msg_dict)
-        except Exception as e:  # pragma: no cover - defensive
-            print(f"Warning: Failed to create Message: {e}. Using fallback object.")
-            m = Message.__new__(Message)
-            for k, v in msg_dict.items():
-                setattr(m, k, v)
-            return m
\ No newline at end of file
+        """Build a Message without re-validating locally generated fields."""
+        return Message.model_construct(
+            message_id=uuid4().hex,
+            role=role,
+            content=content,
+            timestamp=datetime.now(timezone.utc),
+        )
\ No newline at end of file
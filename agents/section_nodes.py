@@ -4,34 +4,198 @@ Specialized section nodes with internal routing - no need to go back to AnalyzeU
 Sections handle their own routing including section-to-section switches.
 """
 
-import json
+import asyncio
+import os
 import re
-from typing import Any, Dict, List
-from agents.resume_builder_state import ResumeBuilderState
+import hashlib
+import logging
+import orjson
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from pyagenity.utils import InjectDep
+from agents.resume_builder_state import ResumeBuilderState, freeze_section_object
 from agents.general_chat_section_routing import (
     call_llm_json_decision, safe_extract_text, maybe_print_usage, 
     OFFLINE_MODE, GOOGLE_API_KEY, LLM_MODEL, safe_initialize_answers,
-    detect_question_matches, normalize_section_name
+    detect_question_matches, normalize_section_name, parse_json_object, append_bounded,
+    json_response_format, collect_json_stream, JsonStringFieldStream, throttled_acompletion
 )
-from litellm import acompletion
 
-async def section_chat_node(state: ResumeBuilderState, config: Dict[str, Any]) -> ResumeBuilderState:
+logger = logging.getLogger(__name__)
+
+# -----------------------
+# Static system prompts - kept byte-identical across calls so providers can reuse the cached prefix;
+# everything that changes per turn is sent in the user payload
+# -----------------------
+SECTION_CHAT_SYS_PREFIX = """You are managing one resume section with FULL ROUTING CAPABILITY.
+
+The user payload gives: user_message, current_section, alignment_score, available_sections,
+questions (recommended questions), answers (current answers, same positions) and all_answered.
+
+RESPONSE FORMAT:
+{"action": "stay|switch_section|exit_section|trigger_updater|trigger_applier", "target_section": "section_name_or_null", "answer": "response_text", "updated_answers": [...] }
+
+ROUTING RULES:
+1. action='switch_section' if user wants to go to a DIFFERENT section (set target_section)
+2. action='exit_section' if user wants general chat/main menu  
+3. action='trigger_updater' if all questions answered and user hasn't seen updated content
+4. action='trigger_applier' if user says "apply", "yes" (to apply), "save changes"
+5. action='stay' for normal chat within current section
+
+SPECIAL CASE: If user mentions the SAME section they're already in, just acknowledge and stay (action='stay')
+
+CHAT RULES:
+1. If user_message starts with "SECTION_ENTRY":
+   - Welcome to current_section
+   - Show alignment_score
+   - List unanswered questions in numbered format
+   
+2. If user is answering questions:
+   - Update 'updated_answers' array with new answers in correct positions
+   - Acknowledge briefly, show remaining questions
+   
+3. Always end with numbered list of remaining unanswered questions (if any)
+4. Keep responses under 120 words, be conversational
+5. Handle section switches directly - don't defer to other systems"""
+
+UPDATER_SYS_PREFIX = """Rewrite a resume section based on the user's answers AND evaluate the rewrite's alignment with the job description.
+
+The user payload gives: job_description, section, original_content and questions_and_answers.
+
+RESPONSE FORMAT (JSON):
+{"updated_content": "new_content", "summary": "brief_summary", "alignment_score": <0-100>, "missing_requirements": ["req1", "req2"], "recommended_questions": ["q1", "q2"], "analysis_summary": "brief_summary"}
+
+RULES:
+1. Keep same format/structure as original
+2. Enhance with details from answers
+3. Don't remove good existing content
+4. Be concise and professional
+5. Score updated_content (not the original) - focus on most important gaps, max 3-4 requirements, 2-4 targeted questions"""
+
+ANALYZER_SYS_PREFIX = """Analyze updated resume section alignment with job requirements.
+
+The user message gives the JOB DESCRIPTION, the SECTION name and its updated CONTENT.
+
+RESPONSE FORMAT (JSON):
+{"alignment_score": <0-100>, "missing_requirements": ["req1", "req2"], "recommended_questions": ["q1", "q2"], "analysis_summary": "brief_summary"}
+
+Focus on most important gaps, max 3-4 requirements, 2-4 targeted questions."""
+
+_NL = "\n"
+
+# Max analyses in flight when scoring several sections at once (provider RPM limits)
+ANALYSIS_CONCURRENCY = 8
+
+# On-disk analysis cache: one JSON file per (model, prompts, JD, section, content) digest, reused
+# across runs. Anchored to the project directory so runs from any CWD share it.
+ANALYSIS_CACHE_DIR = Path(os.environ.get("ANALYSIS_CACHE_DIR") or Path(__file__).resolve().parent.parent / ".cache" / "analysis")
+
+# Output token caps per node - replies are small JSON objects, so keep decoding short
+SECTION_CHAT_MAXTOK = 220
+UPDATER_MAXTOK = 600  # rewrite budget for long sections
+UPDATER_SHORT_MAXTOK = 300  # rewrite budget for sections under UPDATER_LONG_CONTENT_CHARS
+UPDATER_LONG_CONTENT_CHARS = 1200
+APPLIER_MAXTOK = 400  # analysis budget, also added to the fused updater reply
+
+# Navigation/confirmation turns that are answered locally instead of by the LLM.
+# Anchored to the whole message so "yes, I used terraform" still goes to the model.
+_FAST_APPLY_RE = re.compile(r"^\s*(?:yes|yep|apply|save)(?:\s+(?:it|them|this|changes|the\s+changes))?(?:\s+please)?\s*[.!]*\s*$", re.IGNORECASE)
+_FAST_EXIT_RE = re.compile(r"^\s*(?:exit|back|menu)(?:\s+to\s+(?:the\s+)?(?:general(?:\s+chat)?|main\s+menu|menu))?\s*[.!]*\s*$", re.IGNORECASE)
+# A one-word reply may well answer a question ("work", "about"), so aliases only count as a
+# switch behind an explicit verb; without one, only the exact section name does
+_FAST_SECTION_RE = re.compile(r"^\s*(?P<verb>(?:go|switch|move)\s+to\s+)?(?:the\s+)?(?P<name>[a-z]+)(?:\s+section)?\s*[.!]*\s*$", re.IGNORECASE)
+
+def _fast_classify(user_text: str, available_sections: Sequence[str], has_proposal: bool,
+                   current_section: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Classify trivial section turns without an LLM call.
+    Returns a decision shaped like the LLM's, or None when the turn needs the model.
+    """
+    if _FAST_EXIT_RE.match(user_text):
+        return {"action": "exit_section", "target_section": None, "answer": ""}
+    if has_proposal and _FAST_APPLY_RE.match(user_text):
+        # "yes" only means apply while a proposal is pending; otherwise it may answer a question
+        return {"action": "trigger_applier", "target_section": None, "answer": ""}
+    match = _FAST_SECTION_RE.match(user_text)
+    if match:
+        name = match.group("name").lower()
+        if match.group("verb"):
+            target = normalize_section_name(name, available_sections, fuzzy=False)
+        else:
+            target = name if name in available_sections else None
+        if target == current_section:
+            # Same section - no answer, so the caller's "You're already in ..." reply is used
+            return {"action": "switch_section", "target_section": target, "answer": ""}
+        if target:
+            return {"action": "switch_section", "target_section": target, "answer": f"Switching to {target}."}
+    return None
+
+# JSON schemas for the structured replies (see json_response_format)
+SECTION_DECISION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "action": {"type": "string", "enum": ["stay", "switch_section", "exit_section", "trigger_updater", "trigger_applier"]},
+        "target_section": {"type": "string"},
+        "answer": {"type": "string"},
+        "updated_answers": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["action", "answer"]
+}
+
+_ANALYSIS_PROPERTIES = {
+    "alignment_score": {"type": "integer"},
+    "missing_requirements": {"type": "array", "items": {"type": "string"}},
+    "recommended_questions": {"type": "array", "items": {"type": "string"}},
+    "analysis_summary": {"type": "string"}
+}
+
+ANALYZER_SCHEMA = {
+    "type": "object",
+    "properties": _ANALYSIS_PROPERTIES,
+    "required": list(_ANALYSIS_PROPERTIES)
+}
+
+UPDATER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "updated_content": {"type": "string"},
+        "summary": {"type": "string"},
+        **_ANALYSIS_PROPERTIES
+    },
+    "required": ["updated_content", "summary", *_ANALYSIS_PROPERTIES]
+}
+
+def _lead_reply(state: ResumeBuilderState, before: Any, lead: str) -> None:
+    """Put `lead` at the top of the reply appended since `before` (only the last message is shown)."""
+    last = state.context[-1] if state.context else None
+    if last is None or last is before or last.role != "assistant":
+        append_bounded(state, state.make_message("assistant", lead))
+        return
+    # Messages are shared with checkpoint snapshots, so replace rather than edit in place
+    state.context[-1] = state.make_message("assistant", f"{lead}{_NL}{_NL}{last.content}")
+
+async def section_chat_node(
+    state: ResumeBuilderState,
+    config: Dict[str, Any],
+    stream_delta: InjectDep[Callable[[str], None]] = None,
+) -> ResumeBuilderState:
     """
     Handle conversations within a section + internal routing (section switches, exits).
-    This node now handles ALL section routing decisions internally.
+    This node now handles ALL section routing decisions internally, and runs the
+    updater/applier inline so those turns finish without extra graph hops.
     """
-    print(f"\n--- Section Chat: {state.current_section} ---")
+    logger.debug("--- Section Chat: %s ---", state.current_section)
     
     if not state.current_section:
         # Shouldn't happen, but handle gracefully
-        state.context.append(state.make_message("assistant", "Please select a section to work on."))
+        append_bounded(state, state.make_message("assistant", "Please select a section to work on."))
         state.next_action = "exit_to_general"
         return state
     
     # Get section data
     section_data = state.section_objects.get(state.current_section, {})
     recommended_questions = section_data.get("recommended_questions", [])
-    available_sections = list(state.section_objects.keys())
+    available_sections, sorted_sections = state.get_section_names()
     
     # Initialize answers if needed
     safe_initialize_answers(state, state.current_section, recommended_questions)
@@ -39,13 +203,18 @@ async def section_chat_node(state: ResumeBuilderState, config: Dict[str, Any]) -
     
     # Get the last user message
     last_msg = state.context[-1] if state.context else None
-    is_first_entry = not last_msg or getattr(last_msg, "role", "") != "user"
+    is_first_entry = last_msg is None or last_msg.role != "user"
+    if not is_first_entry and state.next_action == "section_chat":
+        # GeneralChat just routed here on this message - if it only names this section
+        # ("skills"), it was the way in, not a request to switch: greet as on a fresh entry
+        entry = _fast_classify(last_msg.content or "", available_sections, False, state.current_section)
+        is_first_entry = entry is not None and entry.get("target_section") == state.current_section
     user_text = ""
     
     if is_first_entry:
         user_text = f"SECTION_ENTRY: User just entered {state.current_section} section."
     else:
-        user_text = getattr(last_msg, "content", "") or ""
+        user_text = last_msg.content or ""
     
     # Check if all questions are answered
     all_questions_answered = (
@@ -54,45 +223,11 @@ async def section_chat_node(state: ResumeBuilderState, config: Dict[str, Any]) -
         all(answer and len(str(answer).strip()) > 0 for answer in current_answers)
     )
     
-    # Enhanced system prompt with internal routing logic
-    system_prompt = f"""You are managing the {state.current_section} section with FULL ROUTING CAPABILITY.
-
-SECTION INFO:
-- Current questions: {recommended_questions}
-- Current answers: {current_answers} 
-- All questions answered: {all_questions_answered}
-- Available sections: {available_sections}
-
-RESPONSE FORMAT:
-{{"action": "stay|switch_section|exit_section|trigger_updater|trigger_applier", "target_section": "section_name_or_null", "answer": "response_text", "updated_answers": [...] }}
-
-ROUTING RULES:
-1. action='switch_section' if user wants to go to a DIFFERENT section (set target_section)
-2. action='exit_section' if user wants general chat/main menu  
-3. action='trigger_updater' if all questions answered and user hasn't seen updated content
-4. action='trigger_applier' if user says "apply", "yes" (to apply), "save changes"
-5. action='stay' for normal chat within current section
-
-SPECIAL CASE: If user mentions the SAME section they're already in, just acknowledge and stay (action='stay')
-
-CHAT RULES:
-1. If user_text starts with "SECTION_ENTRY":
-   - Welcome to {state.current_section} section
-   - Show alignment score: {section_data.get('alignment_score', 'Not calculated')}
-   - List unanswered questions in numbered format
-   
-2. If user is answering questions:
-   - Update 'updated_answers' array with new answers in correct positions
-   - Acknowledge briefly, show remaining questions
-   
-3. Always end with numbered list of remaining unanswered questions (if any)
-4. Keep responses under 120 words, be conversational
-5. Handle section switches directly - don't defer to other systems"""
-
-    # Prepare payload
+    # Static rules live in SECTION_CHAT_SYS_PREFIX; only this payload changes per turn
     payload = {
         "user_message": user_text,
         "current_section": state.current_section,
+        "alignment_score": section_data.get("alignment_score", "Not calculated"),
         "available_sections": available_sections,
         "questions": recommended_questions,
         "answers": current_answers,
@@ -100,7 +235,14 @@ CHAT RULES:
     }
     
     try:
-        parsed = await call_llm_json_decision(system_prompt, payload, max_tokens=500)
+        parsed = None if is_first_entry else _fast_classify(
+            user_text, available_sections, bool(state.proposed_section_content), state.current_section
+        )
+        if parsed is None:
+            parsed = await call_llm_json_decision(
+                SECTION_CHAT_SYS_PREFIX, payload, max_tokens=SECTION_CHAT_MAXTOK,
+                schema=SECTION_DECISION_SCHEMA, schema_name="section_decision"
+            )
         
         # Handle answer updates first
         if 'updated_answers' in parsed and isinstance(parsed['updated_answers'], list):
@@ -111,7 +253,8 @@ CHAT RULES:
                 if i < len(current_answers) and answer and answer.strip():
                     state.recommended_answers[state.current_section][i] = answer.strip()
             
-            print(f"Updated answers for {state.current_section}")
+            state._qa_block_cache.pop(state.current_section, None)
+            logger.debug("Updated answers for %s", state.current_section)
         
         # Handle routing decisions
         action = parsed.get("action", "stay")
@@ -126,21 +269,21 @@ CHAT RULES:
                 # Switch to different section
                 state.current_section = normalized_section
                 state.next_action = "section_chat"  # Continue in section chat
-                print(f"Switching to section: {normalized_section}")
+                logger.debug("Switching to section: %s", normalized_section)
                 if answer_text:
-                    state.context.append(state.make_message("assistant", answer_text))
+                    append_bounded(state, state.make_message("assistant", answer_text))
                 return state
             elif normalized_section == state.current_section:
                 # User mentioned same section they're already in
                 state.next_action = "section_chat"
                 same_section_msg = answer_text or f"You're already in the {state.current_section} section. How can I help you improve it?"
-                state.context.append(state.make_message("assistant", same_section_msg))
+                append_bounded(state, state.make_message("assistant", same_section_msg))
                 return state
             else:
                 # Invalid section name
                 state.next_action = "section_chat"
-                error_msg = f"I couldn't find section '{target_section}'. Available: {', '.join(sorted(available_sections))}. Staying in {state.current_section}."
-                state.context.append(state.make_message("assistant", error_msg))
+                error_msg = f"I couldn't find section '{target_section}'. Available: {', '.join(sorted_sections)}. Staying in {state.current_section}."
+                append_bounded(state, state.make_message("assistant", error_msg))
                 return state
                 
         elif action == "exit_section":
@@ -148,44 +291,54 @@ CHAT RULES:
             state.current_section = None
             state.next_action = "exit_to_general"
             exit_msg = answer_text or "Returning to general chat. How can I help with your resume?"
-            state.context.append(state.make_message("assistant", exit_msg))
+            append_bounded(state, state.make_message("assistant", exit_msg))
             return state
             
         elif action == "trigger_updater":
-            # All questions answered - trigger updater
-            state.next_action = "section_updater"
+            # All questions answered - propose updated content in this same node
+            before = state.context[-1] if state.context else None
+            await section_updater_node(state, config, stream_delta)
             if answer_text:
-                state.context.append(state.make_message("assistant", answer_text))
+                _lead_reply(state, before, answer_text)
+            state.next_action = None  # End the turn - the user reviews the proposal next
             return state
             
         elif action == "trigger_applier":
-            # User wants to apply changes
-            state.next_action = "section_applier"
+            # User wants to apply changes - apply in this same node
+            before = state.context[-1] if state.context else None
+            await section_applier_node(state, config)
             if answer_text:
-                state.context.append(state.make_message("assistant", answer_text))
+                _lead_reply(state, before, answer_text)
+            state.next_action = None  # End the turn with the apply confirmation
             return state
             
         else:
             # action == "stay" or fallback - continue in section
             state.next_action = None  # Clear next_action to end execution
             if answer_text:
-                state.context.append(state.make_message("assistant", answer_text))
+                append_bounded(state, state.make_message("assistant", answer_text))
             return state
         
     except Exception as e:
-        print(f"Error in section_chat_node: {e}")
-        state.context.append(state.make_message(
+        logger.warning("Error in section_chat_node: %s", e)
+        append_bounded(state, state.make_message(
             "assistant", 
             f"I'm here to help with your {state.current_section} section. What would you like to know?"
         ))
         state.next_action = "section_chat"
         return state
 
-async def section_updater_node(state: ResumeBuilderState, config: Dict[str, Any]) -> ResumeBuilderState:
+async def section_updater_node(
+    state: ResumeBuilderState,
+    config: Dict[str, Any],
+    stream_delta: InjectDep[Callable[[str], None]] = None,
+) -> ResumeBuilderState:
     """
     Generate updated section content based on answered questions.
+    If a `stream_delta` callable is registered in the graph's dependency container,
+    the rewritten content is passed to it piece by piece while it is generated.
     """
-    print(f"\n--- Section Updater: {state.current_section} ---")
+    logger.debug("--- Section Updater: %s ---", state.current_section)
     
     if not state.current_section:
         state.next_action = "exit_to_general"
@@ -197,78 +350,93 @@ async def section_updater_node(state: ResumeBuilderState, config: Dict[str, Any]
     current_answers = state.recommended_answers.get(state.current_section, [])
     original_content = state.resume_sections.get(state.current_section, "")
     
-    # System prompt for content generation
-    system_prompt = f"""Generate updated {state.current_section} content based on answers.
-
-ORIGINAL CONTENT: {original_content}
-
-QUESTIONS & ANSWERS:
-{chr(10).join(f"Q{i+1}: {q}\\nA{i+1}: {a}" for i, (q, a) in enumerate(zip(recommended_questions, current_answers)) if a)}
-
-RESPONSE FORMAT:
-{{"updated_content": "new_content", "summary": "brief_summary"}}
-
-RULES:
-1. Keep same format/structure as original
-2. Enhance with details from answers
-3. Don't remove good existing content
-4. Be concise and professional"""
-
+    # Static rules live in UPDATER_SYS_PREFIX; section data goes in the payload
     payload = {
+        "job_description": state.jd_summary or "",
+        "section": state.current_section,
         "original_content": original_content,
-        "questions": recommended_questions,
-        "answers": current_answers
+        "questions_and_answers": render_qa_block(state, state.current_section, recommended_questions, current_answers)
     }
     
     try:
-        parsed = await call_llm_json_decision(system_prompt, payload, max_tokens=600)
+        # One call returns the rewrite and its analysis, so applying needs no further LLM call
+        rewrite_budget = UPDATER_MAXTOK if len(str(original_content)) > UPDATER_LONG_CONTENT_CHARS else UPDATER_SHORT_MAXTOK
+        streamed = False
+        on_delta = None
+        if stream_delta is not None:
+            def on_delta(text: str) -> None:
+                nonlocal streamed
+                streamed = True
+                stream_delta(text)
+        parsed = await rewrite_and_analyze_section(payload, max_tokens=rewrite_budget + APPLIER_MAXTOK, on_delta=on_delta)
         
         updated_content = parsed.get("updated_content", "")
         summary = parsed.get("summary", "Content updated")
         
         if updated_content:
-            # Store proposed content
+            # Store proposed content together with its analysis for the applier
             state.proposed_section_content = updated_content
+            state._pending_analysis = (state.current_section, updated_content, with_analysis_defaults(parsed))
             
-            response_msg = (
-                f"{summary}\n\n"
-                f"**Updated {state.current_section}:**\n\n"
-                f"{updated_content}\n\n"
-                f"Apply these changes? (say 'yes' or 'apply')"
-            )
+            if streamed:
+                # The user already saw the rewrite as it streamed - don't print it a second time
+                response_msg = (
+                    f"{summary}\n\n"
+                    f"Apply the updated {state.current_section} above? (say 'yes' or 'apply')"
+                )
+            else:
+                response_msg = (
+                    f"{summary}\n\n"
+                    f"**Updated {state.current_section}:**\n\n"
+                    f"{updated_content}\n\n"
+                    f"Apply these changes? (say 'yes' or 'apply')"
+                )
         else:
             response_msg = f"Having trouble updating {state.current_section}. Let's continue."
         
-        state.context.append(state.make_message("assistant", response_msg))
+        append_bounded(state, state.make_message("assistant", response_msg))
         state.next_action = "section_chat"  # Return to section chat for confirmation
         return state
         
     except Exception as e:
-        print(f"Error in section_updater_node: {e}")
-        state.context.append(state.make_message(
+        logger.warning("Error in section_updater_node: %s", e)
+        append_bounded(state, state.make_message(
             "assistant",
             f"Trouble updating {state.current_section} content. Let's continue working on it."
         ))
         state.next_action = "section_chat"
         return state
 
+def render_qa_block(state: ResumeBuilderState, section_name: str, questions: Sequence[str], answers: List[str]) -> str:
+    """Render the answered questions as a Q/A block, reusing the last rendering while nothing changed."""
+    key = hash((tuple(questions), tuple(answers)))
+    cached = state._qa_block_cache.get(section_name)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    block = _NL.join(
+        f"Q{i+1}: {q}{_NL}A{i+1}: {a}"
+        for i, (q, a) in enumerate(zip(questions, answers)) if a
+    )
+    state._qa_block_cache[section_name] = (key, block)
+    return block
+
 async def section_applier_node(state: ResumeBuilderState, config: Dict[str, Any]) -> ResumeBuilderState:
     """
     Apply changes and re-analyze section alignment with JD.
     """
-    print(f"\n--- Section Applier: {state.current_section} ---")
+    logger.debug("--- Section Applier: %s ---", state.current_section)
     
     if not state.current_section:
         state.next_action = "exit_to_general"
         return state
     
     # Get content to apply
-    content_to_apply = getattr(state, 'proposed_section_content', None)
+    content_to_apply = state.proposed_section_content
     if not content_to_apply:
         content_to_apply = state.resume_sections.get(state.current_section, "")
     
     if not content_to_apply:
-        state.context.append(state.make_message(
+        append_bounded(state, state.make_message(
             "assistant",
             f"No content to apply for {state.current_section}. Please try again."
         ))
@@ -279,86 +447,249 @@ async def section_applier_node(state: ResumeBuilderState, config: Dict[str, Any]
     await apply_section_changes_internal(state, state.current_section, content_to_apply)
     
     # Clean up
-    if hasattr(state, 'proposed_section_content'):
-        delattr(state, 'proposed_section_content')
+    state.proposed_section_content = None
     
     # Return to section chat with fresh data
     state.next_action = "section_chat"
     return state
 
-async def apply_section_changes_internal(state: ResumeBuilderState, section_name: str, updated_content: str):
-    """Apply changes and re-analyze section."""
-    print(f"\n🔄 APPLYING changes to {section_name}...")
+async def rewrite_and_analyze_section(payload: Dict[str, Any], max_tokens: int = UPDATER_MAXTOK + APPLIER_MAXTOK,
+                                      on_delta: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """
+    Rewrite a section from the user's answers and score the rewrite in a single JSON call.
+    The reply is streamed; on_delta receives the updated_content text as it arrives.
+    """
+    if OFFLINE_MODE:
+        return {}
     
-    # Update resume content
-    if not hasattr(state, 'resume_sections'):
-        state.resume_sections = {}
-    state.resume_sections[section_name] = updated_content
+    messages = [
+        {"role": "system", "content": UPDATER_SYS_PREFIX},
+        {"role": "user", "content": orjson.dumps(payload).decode()}
+    ]
+    
+    extra = {}
+    if GOOGLE_API_KEY:
+        extra["api_key"] = GOOGLE_API_KEY
+    
+    resp = await throttled_acompletion(
+        model=LLM_MODEL, messages=messages, max_completion_tokens=max_tokens, stream=True,
+        response_format=json_response_format("section_update", UPDATER_SCHEMA), **extra
+    )
+    on_piece = None
+    if on_delta is not None:
+        content_stream = JsonStringFieldStream("updated_content")
+        def on_piece(piece: str) -> None:
+            text = content_stream.feed(piece)
+            if text:
+                on_delta(text)
+    raw = await collect_json_stream(resp, "updater", on_piece)
+    if on_delta is not None and content_stream.done:
+        on_delta("\n")
+    
+    try:
+        parsed = parse_json_object(raw)
+    except ValueError:
+        parsed = None
+    return parsed if isinstance(parsed, dict) else {}
+
+def with_analysis_defaults(analysis_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in any analysis keys the model left out."""
+    analysis_result.setdefault("alignment_score", 70)
+    analysis_result.setdefault("missing_requirements", [])
+    analysis_result.setdefault("recommended_questions", [])
+    analysis_result.setdefault("analysis_summary", "Updated successfully")
+    return analysis_result
+
+# Cached analyses come from the analyzer or the fused updater - editing either prompt or
+# schema (or switching LLM_MODEL) must not serve results produced under the old ones
+_ANALYSIS_CACHE_VERSION = hashlib.sha256(orjson.dumps(
+    [LLM_MODEL, ANALYZER_SYS_PREFIX, UPDATER_SYS_PREFIX, ANALYZER_SCHEMA, UPDATER_SCHEMA],
+    option=orjson.OPT_SORT_KEYS,
+)).hexdigest()
+
+def _analysis_cache_path(jd_summary: Optional[str], section_name: str, content: Any) -> Path:
+    key = hashlib.sha256(orjson.dumps(
+        [_ANALYSIS_CACHE_VERSION, jd_summary or "", section_name, content], option=orjson.OPT_SORT_KEYS
+    )).hexdigest()
+    return ANALYSIS_CACHE_DIR / f"{key}.json"
+
+def load_cached_analysis(jd_summary: Optional[str], section_name: str, content: Any) -> Optional[Dict[str, Any]]:
+    """Return a previously stored analysis of exactly this content against this JD, if any."""
+    try:
+        cached = orjson.loads(_analysis_cache_path(jd_summary, section_name, content).read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    return cached if isinstance(cached, dict) else None
+
+def store_cached_analysis(jd_summary: Optional[str], section_name: str, content: Any, analysis: Dict[str, Any]) -> None:
+    """Persist an analysis for later runs; failures only cost the cache hit."""
+    path = _analysis_cache_path(jd_summary, section_name, content)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(orjson.dumps(analysis))
+        os.replace(tmp, path)  # atomic, so a reader never sees a partial file
+    except (OSError, TypeError) as e:
+        logger.debug("Could not write analysis cache: %s", e)
+
+async def analyze_section_content(jd_summary: Optional[str], section_name: str, content: Any) -> Dict[str, Any]:
+    """Score section content against the JD and suggest follow-up questions (disk-cached)."""
+    if OFFLINE_MODE:
+        return {
+            "alignment_score": 75,
+            "missing_requirements": ["More examples needed"],
+            "recommended_questions": [f"Add more examples to {section_name}?"],
+            "analysis_summary": "Offline mode"
+        }
     
-    # Heavy analysis prompt (only used here)
-    analysis_prompt = f"""Analyze updated resume section alignment with job requirements.
+    cached = load_cached_analysis(jd_summary, section_name, content)
+    if cached is not None:
+        return with_analysis_defaults(cached)
+    
+    # Structured sections (lists, dicts, section records) go in as JSON, not as Python reprs
+    content_text = content if isinstance(content, str) else orjson.dumps(content).decode()
+    messages = [
+        {"role": "system", "content": ANALYZER_SYS_PREFIX},
+        {"role": "user", "content": f"JOB DESCRIPTION: {jd_summary or ''}\nSECTION: {section_name}\nCONTENT: {content_text}"}
+    ]
+    
+    extra = {}
+    if GOOGLE_API_KEY:
+        extra["api_key"] = GOOGLE_API_KEY
+    
+    resp = await throttled_acompletion(
+        model=LLM_MODEL, messages=messages, max_completion_tokens=APPLIER_MAXTOK,
+        response_format=json_response_format("section_analysis", ANALYZER_SCHEMA), **extra
+    )
+    maybe_print_usage(resp, f"apply_{section_name}")
+    raw = safe_extract_text(resp) or ""
+    
+    # Extract JSON
+    try:
+        analysis_result = parse_json_object(raw)
+    except ValueError:
+        analysis_result = None
+    if not isinstance(analysis_result, dict):
+        return with_analysis_defaults({})  # don't cache a failed parse
+    store_cached_analysis(jd_summary, section_name, content, analysis_result)
+    return with_analysis_defaults(analysis_result)
 
-JOB DESCRIPTION: {state.jd_summary or ""}
-SECTION: {section_name}
-CONTENT: {updated_content}
+async def analyze_missing_sections(state: ResumeBuilderState, max_concurrency: int = ANALYSIS_CONCURRENCY) -> List[str]:
+    """
+    Analyze every resume section that has no alignment score yet, concurrently
+    (at most max_concurrency calls in flight). Returns the analyzed section names.
+    """
+    pending = [
+        name for name, content in (state.resume_sections or {}).items()
+        if content and "alignment_score" not in state.section_objects.get(name, {})
+    ]
+    if not pending:
+        return []
+    
+    semaphore = asyncio.Semaphore(max_concurrency)
+    async def analyze(name: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await analyze_section_content(state.jd_summary, name, state.resume_sections[name])
+    
+    results = await asyncio.gather(*(analyze(name) for name in pending), return_exceptions=True)
+    analyzed = []
+    for name, result in zip(pending, results):
+        if isinstance(result, BaseException):
+            logger.warning("Initial analysis of %s failed: %s", name, result)
+            continue
+        section = state.section_objects.setdefault(name, {"section_name": name})
+        section.update(freeze_section_object({
+            "alignment_score": result["alignment_score"],
+            "missing_requirements": result["missing_requirements"],
+            "recommended_questions": result["recommended_questions"]
+        }))
+        analyzed.append(name)
+    state._cached_sections = ()
+    return analyzed
 
-RESPONSE FORMAT (JSON):
-{{"alignment_score": <0-100>, "missing_requirements": ["req1", "req2"], "recommended_questions": ["q1", "q2"], "analysis_summary": "brief_summary"}}
+async def warm_analysis_cache(state: ResumeBuilderState, max_concurrency: int = ANALYSIS_CONCURRENCY) -> List[str]:
+    """
+    Analyze the current content of every non-empty section into the on-disk cache (at most
+    max_concurrency calls in flight), leaving the state's seeded scores untouched.
+    Returns the names of the sections whose analysis is now cached.
+    """
+    if OFFLINE_MODE:
+        logger.warning("No API key configured - nothing to warm")
+        return []
+    names = [name for name, content in (state.resume_sections or {}).items() if content]
+    
+    semaphore = asyncio.Semaphore(max_concurrency)
+    async def analyze(name: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await analyze_section_content(state.jd_summary, name, state.resume_sections[name])
+    
+    results = await asyncio.gather(*(analyze(name) for name in names), return_exceptions=True)
+    warmed = []
+    for name, result in zip(names, results):
+        if isinstance(result, BaseException):
+            logger.warning("Warming the analysis of %s failed: %s", name, result)
+        elif load_cached_analysis(state.jd_summary, name, state.resume_sections[name]) is not None:
+            warmed.append(name)
+    return warmed
 
-Focus on most important gaps, max 3-4 requirements, 2-4 targeted questions."""
+async def take_section_analysis(state: ResumeBuilderState, section_name: str, content: Any) -> Dict[str, Any]:
+    """Return the analysis the updater produced for this exact content, else analyze now."""
+    pending = state._pending_analysis
+    state._pending_analysis = None
+    if pending is not None and pending[0] == section_name and pending[1] == content:
+        analysis = {key: pending[2][key] for key in _ANALYSIS_PROPERTIES}  # not the rewrite itself
+        store_cached_analysis(state.jd_summary, section_name, content, analysis)
+        return analysis
+    return await analyze_section_content(state.jd_summary, section_name, content)
+
+def hash_section_content(content: Any) -> str:
+    """Digest of section content (string, list or dict) used to detect unchanged re-applies."""
+    raw = content.encode() if isinstance(content, str) else orjson.dumps(content, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+async def apply_section_changes_internal(state: ResumeBuilderState, section_name: str, updated_content: str):
+    """Apply changes and re-analyze section (skipped when the content is what was last analyzed)."""
+    logger.debug("Applying changes to %s", section_name)
+    
+    # Update resume content
+    if state.resume_sections is None:
+        state.resume_sections = {}
+    state.resume_sections[section_name] = updated_content
     
     try:
-        messages = [
-            {"role": "system", "content": analysis_prompt},
-            {"role": "user", "content": f"Section: {section_name}\nContent: {updated_content}"}
-        ]
+        content_hash = hash_section_content(updated_content)
+        section_data = state.section_objects.get(section_name)
+        if section_data and section_data.get("_content_hash") == content_hash:
+            # Same content as the last analysis - keep its score, questions and answers
+            state._pending_analysis = None
+            append_bounded(state, state.make_message(
+                "assistant",
+                f"✅ {section_name} is unchanged - alignment stays at {section_data.get('alignment_score')}%."
+            ))
+            logger.debug("%s unchanged - skipped re-analysis", section_name)
+            return
         
-        extra = {}
-        if GOOGLE_API_KEY:
-            extra["api_key"] = GOOGLE_API_KEY
-
-        if OFFLINE_MODE:
-            analysis_result = {
-                "alignment_score": 75,
-                "missing_requirements": ["More examples needed"],
-                "recommended_questions": [f"Add more examples to {section_name}?"],
-                "analysis_summary": "Offline mode"
-            }
-        else:
-            resp = await acompletion(model=LLM_MODEL, messages=messages, max_completion_tokens=400, **extra)
-            maybe_print_usage(resp, f"apply_{section_name}")
-            raw = safe_extract_text(resp) or ""
-            
-            # Extract JSON
-            analysis_result = {}
-            try:
-                json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', raw, re.DOTALL)
-                if json_match:
-                    analysis_result = json.loads(json_match.group(0))
-            except:
-                pass
-            
-            # Defaults
-            analysis_result.setdefault("alignment_score", 70)
-            analysis_result.setdefault("missing_requirements", [])
-            analysis_result.setdefault("recommended_questions", [])
-            analysis_result.setdefault("analysis_summary", "Updated successfully")
+        # Usually already produced by the updater's fused rewrite + analysis call
+        analysis_result = await take_section_analysis(state, section_name, updated_content)
         
         # Update state
         if section_name not in state.section_objects:
             state.section_objects[section_name] = {}
+            state._cached_sections = ()
         
-        state.section_objects[section_name].update({
+        state.section_objects[section_name].update(freeze_section_object({
             "alignment_score": analysis_result["alignment_score"],
             "missing_requirements": analysis_result["missing_requirements"],
-            "recommended_questions": analysis_result["recommended_questions"]
-        })
+            "recommended_questions": analysis_result["recommended_questions"],
+            "_content_hash": content_hash
+        }))
         
         # Reset answers for new questions
         if analysis_result["recommended_questions"]:
             state.recommended_answers[section_name] = [""] * len(analysis_result["recommended_questions"])
         else:
             state.recommended_answers[section_name] = []
+        state._qa_block_cache.pop(section_name, None)
         
         # Confirmation message
         confirmation_msg = (
@@ -372,10 +703,10 @@ Focus on most important gaps, max 3-4 requirements, 2-4 targeted questions."""
         else:
             confirmation_msg += "Section complete! Switch to another section or continue refining."
         
-        state.context.append(state.make_message("assistant", confirmation_msg))
-        print(f"✅ {section_name} updated - Score: {analysis_result['alignment_score']}%")
+        append_bounded(state, state.make_message("assistant", confirmation_msg))
+        logger.debug("%s updated - Score: %s%%", section_name, analysis_result["alignment_score"])
         
     except Exception as e:
-        print(f"❌ Error applying changes: {e}")
+        logger.warning("Error applying changes to %s: %s", section_name, e)
         error_msg = f"✅ Changes saved to {section_name}, but analysis failed. Continue working on this section."
-        state.context.append(state.make_message("assistant", error_msg))
\ No newline at end of file
+        append_bounded(state, state.make_message("assistant", error_msg))
\ No newline at end of file
@@ -1,9 +1,11 @@
 # graph_builder.py
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional, Callable
-import json
+import orjson
 import os
-import re
+import threading
+from collections import deque
 from uuid import uuid4
 
 from pyagenity.graph import (
@@ -26,16 +28,30 @@ from pyagenity.checkpointer import InMemoryCheckpointer
 from pyagenity.publisher import ConsolePublisher # Example publisher
 
 # Import your custom state and agent nodes
-from agents.resume_builder_state import ResumeBuilderState
+from agents.resume_builder_state import ResumeBuilderState, SECTION_NAMES
 from agents.general_chat_section_routing import general_chat_and_section_routing
 
 # Import new specialized section nodes
-from agents.section_nodes import section_chat_node, section_updater_node, section_applier_node
+from agents.section_nodes import section_chat_node
 
 # Import LLM helpers from the routing module
 from agents.general_chat_section_routing import call_llm_json_decision, safe_extract_text, maybe_print_usage, OFFLINE_MODE, GOOGLE_API_KEY, LLM_MODEL
 from litellm import acompletion
 
+logger = logging.getLogger(__name__)
+
+# Sections GeneralChat may route into
+_VALID_SECTIONS: frozenset = frozenset(SECTION_NAMES)
+
+RECURSION_LIMIT = 50  # Reasonable recursion limit per turn
+
+# Compiled graph shared by all sessions - see get_resume_graph()
+_COMPILED_GRAPH: CompiledGraph[ResumeBuilderState] | None = None
+
+def _print_stream_delta(text: str) -> None:
+    """Default `stream_delta` dependency: echo streamed section rewrites to the console."""
+    print(text, end="", flush=True)
+
 def build_resume_graph(
     checkpointer: InMemoryCheckpointer[ResumeBuilderState] | None = None,
     publisher: ConsolePublisher | None = None,
@@ -49,12 +65,14 @@ def build_resume_graph(
         initial_state: If provided, this pre-populated state (with jd_summary, section_objects,
             resume_sections, etc.) is used instead of a fresh blank state.
     """
-    print("Building the resume builder graph...")
+    logger.debug("Building the resume builder graph...")
 
     checkpointer = checkpointer or InMemoryCheckpointer[ResumeBuilderState]()
     publisher = publisher or ConsolePublisher()
     dependency_container = dependency_container or DependencyContainer()
     callback_manager = callback_manager or CallbackManager()
+    if not dependency_container.has("stream_delta"):
+        dependency_container.register("stream_delta", _print_stream_delta)
 
     graph = StateGraph[ResumeBuilderState](
         state=initial_state or ResumeBuilderState(),
@@ -68,8 +86,6 @@ def build_resume_graph(
 
     # Add specialized section nodes that handle their own routing
     graph.add_node("SectionChat", section_chat_node)
-    graph.add_node("SectionUpdater", section_updater_node) 
-    graph.add_node("SectionApplier", section_applier_node)
 
     # --- Define Edges ---
     # Start with general chat
@@ -77,71 +93,36 @@ def build_resume_graph(
 
     def route_from_general_chat(state):
         """Route from GeneralChat - only handles initial routing TO sections."""
-        next_action = getattr(state, 'next_action', None)
+        next_action = state.next_action
         
-        print(f"[GENERAL_CHAT_ROUTER] Next action: {next_action}")
-        print(f"[GENERAL_CHAT_ROUTER] Current section: {state.current_section}")
+        logger.debug("[GENERAL_CHAT_ROUTER] Next action: %s, current section: %s", next_action, state.current_section)
         
         # Check routing attempt limits
-        max_attempts = getattr(state, 'routing_attempts', 0)
+        max_attempts = state.routing_attempts
         if max_attempts >= 3:
-            print("[GENERAL_CHAT_ROUTER] Max routing attempts reached, ending conversation")
+            logger.debug("[GENERAL_CHAT_ROUTER] Max routing attempts reached, ending conversation")
             return END
         
-        valid_sections = {
-            "skills", "experiences", "education", "projects",
-            "summary", "contact", "certificates", "publications", 
-            "languages", "recommendations", "custom"
-        }
-        
         # Only route TO sections from general chat
-        if next_action == "section_chat" and state.current_section in valid_sections:
+        if next_action == "section_chat" and state.current_section in _VALID_SECTIONS:
             return "SectionChat"
         
-        print("[GENERAL_CHAT_ROUTER] Staying in general chat or ending")
+        logger.debug("[GENERAL_CHAT_ROUTER] Staying in general chat or ending")
         return END
 
     def route_from_section_chat(state):
         """Route from SectionChat - handles internal section routing."""
-        next_action = getattr(state, 'next_action', None)
-        print(f"[SECTIONCHAT_ROUTER] Next action: {next_action}")
+        next_action = state.next_action
+        logger.debug("[SECTIONCHAT_ROUTER] Next action: %s", next_action)
         
-        if next_action == "section_updater":
-            return "SectionUpdater"
-        elif next_action == "section_applier":
-            return "SectionApplier"
-        elif next_action == "exit_to_general":
+        if next_action == "exit_to_general":
             return "GeneralChat"
         elif next_action == "section_chat":
             # Stay in section chat (loop back to self)
             return "SectionChat"
         else:
-            # Default: stay in section chat
-            return "SectionChat"
-
-    def route_from_section_updater(state):
-        """Route from SectionUpdater."""
-        next_action = getattr(state, 'next_action', None)
-        print(f"[SECTIONUPDATER_ROUTER] Next action: {next_action}")
-        
-        if next_action == "section_applier":
-            return "SectionApplier"
-        elif next_action == "exit_to_general":
-            return "GeneralChat"
-        else:
-            # Default: back to section chat
-            return "SectionChat"
-
-    def route_from_section_applier(state):
-        """Route from SectionApplier."""
-        next_action = getattr(state, 'next_action', None)
-        print(f"[SECTIONAPPLIER_ROUTER] Next action: {next_action}")
-        
-        if next_action == "exit_to_general":
-            return "GeneralChat"
-        else:
-            # Default: back to section chat with fresh data
-            return "SectionChat"
+            # No pending action: the reply is ready, wait for the next user turn
+            return END
 
     # Add conditional edges
     graph.add_conditional_edges(
@@ -157,44 +138,96 @@ def build_resume_graph(
         "SectionChat", 
         route_from_section_chat,
         {
-            "SectionUpdater": "SectionUpdater",
-            "SectionApplier": "SectionApplier", 
             "GeneralChat": "GeneralChat",
             "SectionChat": "SectionChat",  # Self-loop for staying in section
             END: END  # End execution when staying in section without specific action
         }
     )
     
-    graph.add_conditional_edges(
-        "SectionUpdater",
-        route_from_section_updater, 
-        {
-            "SectionChat": "SectionChat",
-            "SectionApplier": "SectionApplier",
-            "GeneralChat": "GeneralChat"
-        }
-    )
-
-    graph.add_conditional_edges(
-        "SectionApplier",
-        route_from_section_applier,
-        {
-            "SectionChat": "SectionChat",
-            "GeneralChat": "GeneralChat"
-        }
-    )
-
     # --- Compile the graph ---
-    print("Compiling the graph...")
+    logger.debug("Compiling the graph...")
     compiled_graph = graph.compile(checkpointer=checkpointer)
-    print("Graph compiled successfully.")
+    logger.debug("Graph compiled successfully.")
 
     return compiled_graph
 
+def _read_line(prompt: str) -> "asyncio.Future[str]":
+    """input() on a daemon thread, so an unanswered prompt never holds up interpreter exit.
+
+    (asyncio.to_thread would park the call in the default executor, which asyncio.run joins
+    on shutdown - Ctrl-C at the prompt would then hang until Enter is pressed.)
+    """
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future = loop.create_future()
+
+    def _settle(value: Any, error: BaseException | None) -> None:
+        if future.done():
+            return
+        if error is None:
+            future.set_result(value)
+        else:
+            future.set_exception(error)
+
+    def _worker() -> None:
+        try:
+            value, error = input(prompt), None
+        except Exception as e:  # EOFError on Ctrl-D / closed stdin
+            value, error = None, e
+        try:
+            loop.call_soon_threadsafe(_settle, value, error)
+        except RuntimeError:
+            pass  # Loop already closed - the session is over
+
+    threading.Thread(target=_worker, name="stdin-reader", daemon=True).start()
+    return future
+
+async def _wait_or_stop(task: "asyncio.Future[Any]", stop_event: asyncio.Event | None) -> bool:
+    """Wait for task, or for stop_event to be set; True if the task finished first."""
+    if stop_event is None:
+        await asyncio.wait({task})
+        return True
+    stopper = asyncio.ensure_future(stop_event.wait())
+    try:
+        await asyncio.wait({task, stopper}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        stopper.cancel()
+    return task.done()
+
+def get_resume_graph() -> CompiledGraph[ResumeBuilderState]:
+    """Return the process-wide compiled graph, building it on first use.
+
+    The topology is the same for every session; per-session data is seeded into the
+    graph's checkpointer with attach_initial_state() instead of rebuilding the graph.
+    """
+    global _COMPILED_GRAPH
+    if _COMPILED_GRAPH is None:
+        _COMPILED_GRAPH = build_resume_graph()
+    return _COMPILED_GRAPH
+
+async def attach_initial_state(
+    compiled_graph: CompiledGraph[ResumeBuilderState],
+    initial_state: ResumeBuilderState,
+    thread_id: str | None = None,
+) -> Dict[str, Any]:
+    """Seed a session's pre-populated state in the graph's checkpointer.
+
+    Returns the invocation config (thread_id + recursion limit) for that session.
+    """
+    config = {"thread_id": thread_id or str(uuid4()), "recursion_limit": RECURSION_LIMIT}
+    await compiled_graph.checkpointer.aput_state(config, initial_state)
+    return config
+
 # --- Interactive Terminal Chat Runner ---
-async def run_interactive_session(compiled_graph: CompiledGraph[ResumeBuilderState]):
+async def run_interactive_session(compiled_graph: CompiledGraph[ResumeBuilderState], config: Dict[str, Any] | None = None,
+                                  stop_event: asyncio.Event | None = None):
     """
     Runs an interactive chat session with the compiled PyAgenity graph.
+
+    Parameters:
+        config: Session config from attach_initial_state(); a fresh thread is used if omitted.
+        stop_event: Set (e.g. by a SIGINT handler) to end the session. At the prompt it ends
+            right away; during a turn the in-flight reply is finished first, unless the event
+            is set a second time.
     """
     print("\nWelcome to the Resume Builder Chat!")
     print("Type 'quit' or 'exit' to end the session.")
@@ -202,45 +235,48 @@ async def run_interactive_session(compiled_graph: CompiledGraph[ResumeBuilderSta
     print("You can also route to sections like 'skills', 'experiences', etc.")
     print("To exit a section, say 'back to general chat' or 'exit section'.")
 
-    # Helper: extract last assistant message from a list
-    def _last_assistant(msgs: List[Message]) -> Message | None:
+    # Helper: text of the last assistant message in a list, in one reverse pass.
+    # Returns None when there is no assistant message, "" when it is routing JSON (not shown).
+    def _last_assistant_text(msgs: List[Message]) -> Optional[str]:
         for m in reversed(msgs):
-            if getattr(m, "role", None) == "assistant":
-                return m
+            if m.role != "assistant":
+                continue
+            content = m.content or ""
+            if content.startswith("{"):
+                try:
+                    parsed = orjson.loads(content)
+                    if isinstance(parsed, dict) and "route" in parsed:
+                        return ""
+                except orjson.JSONDecodeError:
+                    pass
+            return content
         return None
 
     # Helper: print assistant message from invocation result
     def _print_from_result(result: Dict[str, Any]) -> None:
         msgs = result.get("messages", []) if isinstance(result, dict) else []
-        assistant = _last_assistant(msgs)
-        if not assistant and isinstance(result, dict):
+        text = _last_assistant_text(msgs)
+        if text is None and isinstance(result, dict):
             st = result.get("state")
             if st is not None:
                 ctx = getattr(st, "context", None) or (st.get("context") if isinstance(st, dict) else None)
                 if ctx:
-                    assistant = _last_assistant(ctx)
-        if assistant:
-            content = assistant.content
-            # Check if it's a JSON routing message and skip printing it
-            try:
-                parsed = json.loads(content)
-                if "route" in parsed:
-                    # Don't print routing JSON
-                    return
-            except:
-                pass
-            print(f"AI: {content}")
-        else:
+                    text = _last_assistant_text(ctx)
+        if text is None:
             print("AI: (No response generated)")
+        elif text:
+            print(f"AI: {text}")
 
-    # Initial setup
-    initial_input: Dict[str, Any] = {"messages": [Message.from_text("SESSION_START", role="system")]}
-    config = {"thread_id": str(uuid4()), "recursion_limit": 50}  # Reasonable recursion limit
+    # Initial setup - recent messages are kept in a bounded deque (oldest dropped on append)
+    history: deque = deque([Message.from_text("SESSION_START", role="system")], maxlen=20)
+    initial_input: Dict[str, Any] = {"messages": list(history)}
+    config = config or {"thread_id": str(uuid4()), "recursion_limit": RECURSION_LIMIT}
 
     # First automatic invocation (assistant greets)
     try:
         first_result = await compiled_graph.ainvoke(initial_input, config, response_granularity="full")
-        initial_input["messages"] = first_result.get("messages", [])
+        history.clear()
+        history.extend(first_result.get("messages", []))
         if (new_state := first_result.get("state")):
             initial_input["state"] = new_state
         _print_from_result(first_result)
@@ -249,28 +285,47 @@ async def run_interactive_session(compiled_graph: CompiledGraph[ResumeBuilderSta
 
     # Interactive loop
     while True:
-        user_input = input("You: ")
+        line = _read_line("You: ")
+        if not await _wait_or_stop(line, stop_event):
+            print()
+            break
+        try:
+            user_input = line.result()
+        except EOFError:
+            break
         if user_input.lower() in {"quit", "exit"}:
             break
 
-        initial_input["messages"].append(Message.from_text(user_input, role="user"))
+        history.append(Message.from_text(user_input, role="user"))
+        initial_input["messages"] = list(history)  # graph expects a plain list
+        turn = asyncio.ensure_future(
+            compiled_graph.ainvoke(initial_input, config, response_granularity="full")
+        )
+        stopping = False
+        if not await _wait_or_stop(turn, stop_event):
+            # Don't throw away a reply that is already being generated (and paid for)
+            print("\n(Finishing the current reply before exiting - press Ctrl-C again to abort it.)")
+            stop_event.clear()
+            stopping = True
+            if not await _wait_or_stop(turn, stop_event):
+                turn.cancel()
+                await asyncio.wait({turn})
+                break
         try:
-            turn_result = await compiled_graph.ainvoke(initial_input, config, response_granularity="full")
-            initial_input["messages"] = turn_result.get("messages", [])
+            turn_result = turn.result()
+            history.clear()
+            history.extend(turn_result.get("messages", []))
             
             # Update state if returned
             if (new_state := turn_result.get("state")):
                 initial_input["state"] = new_state
             
-            # Trim messages to avoid unbounded growth (keep last 20 instead of 30)
-            if len(initial_input["messages"]) > 20:
-                initial_input["messages"] = initial_input["messages"][-20:]
-            
             _print_from_result(turn_result)
         except Exception as e:
             print(f"An error occurred: {e}")
             import traceback
             traceback.print_exc()
             break
-
-    print("\nChat session ended. Goodbye!")
\ No newline at end of file
+        if stopping:
+            break
+    print("\nChat session ended. Goodbye!")